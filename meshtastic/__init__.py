@@ -11,7 +11,8 @@ properties of SerialInterface:
 the device.
 - nodes - The database of received nodes.  Includes always up-to-date location and username information for each
 node in the mesh.  This is a read-only datastructure.
-- nodesByNum - like "nodes" but keyed by nodeNum instead of nodeId
+- nodesByNum - like "nodes" but keyed by nodeNum instead of nodeId.  Both tables share the same dictionary for
+each node, so an update made through one is visible through the other.
 - myInfo - Contains read-only information about the local radio device (software version, hardware version, etc)
 
 # Published PubSub topics
@@ -34,6 +35,17 @@ you'll see the fields in the dictionary.  decoded.data.payload will contain the
 sendText, decoded.data.text will **also** be populated with the decoded string.  For ASCII these two strings will be the same, but for
 unicode scripts they can be different.
 
+If you want every received packet and do not need topic matching, interface.addPacketCallback(callback) is a
+cheaper alternative to subscribing to "meshtastic.receive": the callback is invoked directly, without going
+through pubsub.
+
+# Performance
+
+Every frame to and from the radio is parsed/serialized with google.protobuf, so make sure a native backend is in use.
+protobuf>=4 uses upb by default, and on protobuf 3.x we select the cpp backend unless PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION
+is already set.  A warning is logged at import time if only the pure python implementation is available.  Alternative
+generated code (pyrobuf etc) is not supported, because we rely on google.protobuf.json_format to provide packets as dictionaries.
+
 # Example Usage
 ```
 import meshtastic
@@ -57,6 +69,7 @@ interface = meshtastic.serial_interface.SerialInterface()
 """
 
 import base64
+import importlib.util
 import logging
 import os
 import platform
@@ -70,13 +83,32 @@ import traceback
 from datetime import datetime
 from typing import *
 
-import google.protobuf.json_format
-import serial # type: ignore[import-untyped]
-import timeago # type: ignore[import-untyped]
-from dotmap import DotMap # type: ignore[import-untyped]
-from google.protobuf.json_format import MessageToJson
+import google.protobuf
+
+
+def _haveProtobufCppExtension():
+    """Return True if this protobuf install ships its compiled cpp extension"""
+    try:
+        return importlib.util.find_spec("google.protobuf.pyext._message") is not None
+    except ImportError:
+        return False
+
+
+# Parsing and serializing protobufs happens for every frame to/from the radio, so we want
+# the native backend.  protobuf>=4 already defaults to upb.  3.x only uses cpp if asked,
+# but asking for it on an install without the compiled extension (sdist builds, platforms
+# without wheels) makes every _pb2 import fail, so only do that if the extension is there.
+# This must happen before any _pb2 module is imported, and an explicit
+# PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION from the user always wins.
+if (
+    int(google.protobuf.__version__.split(".", maxsplit=1)[0]) < 4
+    and _haveProtobufCppExtension()
+):
+    os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "cpp")
+
+# pylint: disable=wrong-import-position
+from google.protobuf.internal import api_implementation
 from pubsub import pub # type: ignore[import-untyped]
-from tabulate import tabulate
 
 from meshtastic import (
     admin_pb2,
@@ -113,6 +145,23 @@ OUR_APP_VERSION = 20300
 publishingThread = DeferredExecution("publishing")
 
 
+def _warnIfSlowProtobuf():
+    """Warn if protobuf is using its pure python implementation
+
+    This runs at import time, so it must use our own logger: the module level
+    logging.warning() would call basicConfig() and override the caller's (or the CLI's)
+    own logging setup.
+    """
+    if api_implementation.Type() not in ("cpp", "upb"):
+        logging.getLogger(__name__).warning(
+            f"Using the slow '{api_implementation.Type()}' protobuf implementation, "
+            "install a protobuf wheel with native (cpp/upb) support for better performance"
+        )
+
+
+_warnIfSlowProtobuf()
+
+
 class ResponseHandler(NamedTuple):
     """A pending response callback, waiting for a response to one of our messages"""
 
@@ -179,10 +228,11 @@ def _onNodeInfoReceive(iface, asDict):
 
 def _receiveInfoUpdate(iface, asDict):
     if "from" in asDict:
-        iface._getOrCreateByNum(asDict["from"])["lastReceived"] = asDict
-        iface._getOrCreateByNum(asDict["from"])["lastHeard"] = asDict.get("rxTime")
-        iface._getOrCreateByNum(asDict["from"])["snr"] = asDict.get("rxSnr")
-        iface._getOrCreateByNum(asDict["from"])["hopLimit"] = asDict.get("hopLimit")
+        n = iface._getOrCreateByNum(asDict["from"])
+        n["lastReceived"] = asDict
+        n["lastHeard"] = asDict.get("rxTime")
+        n["snr"] = asDict.get("rxSnr")
+        n["hopLimit"] = asDict.get("hopLimit")
 
 
 """Well known message payloads can register decoders for automatic protobuf parsing"""
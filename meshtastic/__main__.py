@@ -14,12 +14,12 @@ import yaml
 from google.protobuf.json_format import MessageToDict
 from pubsub import pub
 
-import meshtastic.test
+import meshtastic.serial_interface
+import meshtastic.tcp_interface
 import meshtastic.util
 from meshtastic import channel_pb2, config_pb2, portnums_pb2, remote_hardware
 from meshtastic.version import get_active_version
 from meshtastic.__init__ import BROADCAST_ADDR
-from meshtastic.ble_interface import BLEInterface
 from meshtastic.globals import Globals
 
 
@@ -951,7 +951,9 @@ def common():
             parser.print_help(sys.stderr)
             meshtastic.util.our_exit("", 1)
         elif args.test:
-            result = meshtastic.test.testAll()
+            from meshtastic import test  # pylint: disable=C0415
+
+            result = test.testAll()
             if not result:
                 meshtastic.util.our_exit("Warning: Test was not successful.")
             else:
@@ -971,7 +973,10 @@ def common():
                 our_globals.set_logfile(logfile)
 
             subscribe()
+            # bleak is slow to import, so we only load BLEInterface if we need it
             if args.ble_scan:
+                from meshtastic.ble_interface import BLEInterface  # pylint: disable=C0415
+
                 logging.debug("BLE scan starting")
                 client = BLEInterface(None, debugOut=logfile, noProto=args.noproto)
                 try:
@@ -982,6 +987,8 @@ def common():
                 meshtastic.util.our_exit("BLE scan finished", 0)
                 return
             elif args.ble:
+                from meshtastic.ble_interface import BLEInterface  # pylint: disable=C0415
+
                 client = BLEInterface(args.ble, debugOut=logfile, noProto=args.noproto)
             elif args.host:
                 try:
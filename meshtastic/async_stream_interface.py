@@ -0,0 +1,150 @@
+"""Asyncio based stream interface class
+
+Needs the optional pyserial-asyncio package (pip3 install meshtastic[async])
+"""
+import asyncio
+import logging
+import threading
+import time
+import traceback
+
+import serial_asyncio  # type: ignore[import-untyped]
+
+from meshtastic.frame_parser import WAKE_BYTES, FrameParser, encodeToRadio
+from meshtastic.mesh_interface import MeshInterface
+from meshtastic.serial_interface import clearHupcl, findSerialDevPath
+
+
+class AsyncStreamInterface(MeshInterface, asyncio.Protocol):
+    """Interface class for meshtastic devices over a serial link, driven by asyncio
+
+    Unlike SerialInterface there is no reader thread polling the port: the asyncio
+    transport hands us whatever bytes have arrived in data_received().  The event
+    loop runs in its own thread, so the API is otherwise the same as SerialInterface,
+    and the port is found and opened the same way (HUPCL cleared, exclusive access).
+    """
+
+    def __init__(self, devPath=None, debugOut=None, noProto=False, connectNow=True):
+        """Constructor, opens a connection to a specified serial port, or if unspecified try to
+        find one Meshtastic device by probing
+
+        Keyword Arguments:
+            devPath {string} -- A filepath to a device, i.e. /dev/ttyUSB0 (default: {None})
+            debugOut {stream} -- If a stream is provided, any debug serial output from the device will be emitted to that stream. (default: {None})
+        """
+        self.noProto = noProto
+        self.devPath = devPath
+
+        if self.devPath is None:
+            self.devPath = findSerialDevPath()
+            if self.devPath is None:
+                return
+
+        self.transport = None
+        self._frameParser = FrameParser(debugOut=debugOut)
+        self._wantExit = False
+        self._transportClosed = threading.Event()
+
+        self._loop = asyncio.new_event_loop()
+        self._loopThread = threading.Thread(
+            target=self._runLoop, name="meshtastic-asyncio", daemon=True
+        )
+
+        MeshInterface.__init__(self, debugOut=debugOut, noProto=noProto)
+
+        if connectNow:
+            self.connect()
+            if not noProto:
+                self.waitForConfig()
+
+    def connect(self):
+        """Connect to our radio
+
+        Normally this is called automatically by the constructor, but if you
+        passed in connectNow=False you can manually connect later.
+        """
+        logging.debug(f"Connecting to {self.devPath}")
+        # set the HUPCL so the device will not reboot based on RTS and/or DTR
+        clearHupcl(self.devPath)
+        self._loopThread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(
+                serial_asyncio.create_serial_connection(
+                    self._loop, lambda: self, self.devPath, baudrate=115200, exclusive=True
+                ),
+                self._loop,
+            ).result()
+        except Exception:
+            self._stopLoop()  # don't leave the loop thread running for a port we never opened
+            raise
+
+        # Wake a sleeping device and force its parser to resync
+        self._writeBytes(WAKE_BYTES)
+        time.sleep(0.1)  # wait 100ms to give device time to start running
+
+        self._startConfig()
+
+        if not self.noProto:  # Wait for the db download if using the protocol
+            self._waitConnected()
+
+    def _runLoop(self):
+        """Body of our event loop thread"""
+        try:
+            self._loop.run_forever()
+        finally:
+            # closed here rather than in close(), which may itself be running on this thread
+            self._loop.close()
+
+    def _stopLoop(self):
+        """Stop our event loop, and wait for it to be closed unless we are running on it"""
+        if self._loopThread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._loopThread != threading.current_thread():
+                self._loopThread.join()
+        elif not self._loop.is_closed():
+            self._loop.close()  # the loop thread was never started
+
+    def connection_made(self, transport):
+        """asyncio callback, our serial port is open"""
+        self.transport = transport
+
+    def data_received(self, data):
+        """asyncio callback, feed newly arrived bytes to our frame parser"""
+        for payload in self._frameParser.feed(data):
+            try:
+                self._handleFromRadio(payload)
+            except Exception as ex:
+                logging.error(f"Error while handling message from radio {ex}")
+                traceback.print_exc()
+
+    def connection_lost(self, exc):
+        """asyncio callback, our serial port was closed"""
+        if not self._wantExit:  # We expect to lose the connection during shutdown
+            logging.warning(f"Meshtastic serial port disconnected, disconnecting... {exc}")
+        self.transport = None
+        self._transportClosed.set()
+        self._disconnected()
+
+    def _writeBytes(self, b):
+        """Write an array of bytes to our stream"""
+        if self.transport:  # ignore writes when stream is closed
+            self._loop.call_soon_threadsafe(self.transport.write, b)
+            # we sleep here to give the TBeam a chance to work, but never block the event loop
+            if threading.current_thread() is not self._loopThread:
+                time.sleep(0.1)
+
+    def _sendToRadioImpl(self, toRadio):
+        """Send a ToRadio protobuf to the device"""
+        self._writeBytes(encodeToRadio(toRadio))
+
+    def close(self):
+        """Close a connection to the device"""
+        logging.debug("Closing async stream")
+        MeshInterface.close(self)
+        self._wantExit = True
+        onLoopThread = self._loopThread == threading.current_thread()
+        if self.transport:
+            self._loop.call_soon_threadsafe(self.transport.close)
+            if not onLoopThread:
+                self._transportClosed.wait(5)
+        self._stopLoop()
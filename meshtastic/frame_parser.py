@@ -0,0 +1,117 @@
+"""Frame parser for stream links (serial, TCP, etc)
+
+Each packet sent over a stream link is framed as START1, START2, a 16 bit big endian
+length and then that many bytes of protobuf.  This module contains only plain python,
+but setup.py will compile it with Cython if Cython is available at build time.
+"""
+import codecs
+import logging
+import struct
+
+START1 = 0x94
+START2 = 0xC3
+HEADER_LEN = 4
+MAX_TO_FROM_RADIO_SIZE = 512
+
+HEADER_STRUCT = struct.Struct(">BBH")
+"""START1, START2 and the big endian payload length"""
+
+WAKE_BYTES = bytes([START2] * 32)
+"""Sent when we connect: bogus UART characters to force a sleeping device to wake, and
+enough start bytes to make its parser resync if it was parsing a bad packet (we don't
+use START1 because we want to ensure it is looking for START1)"""
+
+
+def encodeToRadio(toRadio):
+    """Serialize a ToRadio protobuf into a frame (header and payload) for a stream link"""
+    # Turning the protobuf into text is costly, so only do it if someone will see it
+    if logging.root.isEnabledFor(logging.DEBUG):
+        logging.debug("Sending: %s", " ".join(str(toRadio).split()))
+    b = toRadio.SerializeToString()
+    return HEADER_STRUCT.pack(START1, START2, len(b)) + b
+
+
+class FrameParser:
+    """Incrementally splits the bytes read from a stream into FromRadio payloads"""
+
+    def __init__(self, debugOut=None):
+        """Constructor
+
+        Keyword Arguments:
+            debugOut {stream} -- If a stream is provided, any bytes that are not part of
+                                 a frame (i.e. the device debug console) will be written
+                                 to that stream. (default: {None})
+        """
+        self.debugOut = debugOut
+        # incremental, so a utf-8 character split across two reads still decodes
+        self._debugDecoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        # Big enough for the largest legal frame, we never reallocate it
+        self._rxBuf = bytearray(HEADER_LEN + MAX_TO_FROM_RADIO_SIZE)
+        self._rxLen = 0  # how many bytes of _rxBuf are in use
+        self._packetLen = 0  # payload length from the header of the current frame
+
+    def feed(self, data):
+        """Parse some more bytes read from the stream
+
+        Arguments:
+            data {bytes} -- the bytes that were just read
+
+        Returns a list with the payload of each frame completed by these bytes
+        """
+        if not isinstance(data, (bytes, bytearray)):
+            data = bytes(data)  # we need find(), which memoryview lacks
+        packets = []
+        # hoist our state into locals, this loop runs for every frame we receive
+        rxBuf = self._rxBuf
+        rxLen = self._rxLen
+        packetLen = self._packetLen
+        debugBytes = bytearray()  # bytes outside of any frame, written out once at the end
+        i = 0
+        dataLen = len(data)
+        while i < dataLen:
+            if rxLen == 0:  # looking for START1
+                # Everything up to the next START1 is debug console output, so skip
+                # over it with one C level scan instead of looking at each byte here
+                start = data.find(START1, i)
+                if start < 0:
+                    debugBytes += data[i:]
+                    break
+                debugBytes += data[i:start]
+                rxBuf[0] = START1
+                rxLen = 1
+                i = start + 1
+
+            elif rxLen == 1:  # looking for START2
+                c = data[i]
+                i += 1
+                if c == START2:
+                    rxBuf[1] = c
+                    rxLen = 2
+                else:
+                    rxLen = 0  # failed to find start2
+
+            elif rxLen < HEADER_LEN:  # reading the length
+                rxBuf[rxLen] = data[i]
+                i += 1
+                rxLen += 1
+                if rxLen == HEADER_LEN:  # we _just_ finished reading the header, validate length
+                    packetLen = HEADER_STRUCT.unpack_from(rxBuf)[2]
+                    if packetLen > MAX_TO_FROM_RADIO_SIZE:
+                        rxLen = 0  # length was out out bounds, restart
+                    elif packetLen == 0:
+                        packets.append(b"")
+                        rxLen = 0
+
+            else:  # copy as much of the payload as this read has in one go
+                count = min(packetLen + HEADER_LEN - rxLen, dataLen - i)
+                rxBuf[rxLen : rxLen + count] = data[i : i + count]
+                rxLen += count
+                i += count
+                if rxLen == packetLen + HEADER_LEN:
+                    packets.append(bytes(rxBuf[HEADER_LEN:rxLen]))
+                    rxLen = 0
+        self._rxLen = rxLen
+        self._packetLen = packetLen
+        if debugBytes and self.debugOut is not None:
+            self.debugOut.write(self._debugDecoder.decode(debugBytes))
+        return packets
@@ -36,6 +36,24 @@ from meshtastic.util import (
     stripnl,
 )
 
+# Bound once at import time, these are used for every packet to/from the radio
+_FromRadio = mesh_pb2.FromRadio
+_ToRadio = mesh_pb2.ToRadio
+
+_topicCache = {}
+
+
+def _getTopic(topicName):
+    """Return the pubsub Topic for a dotted topic name
+
+    pub.sendMessage() looks the name up in the topic tree on every call, we only do
+    that the first time and then publish straight to the cached Topic object."""
+    topic = _topicCache.get(topicName)
+    if topic is None:
+        topic = pub.getDefaultTopicMgr().getOrCreateTopic(topicName)
+        _topicCache[topicName] = topic
+    return topic
+
 
 class MeshInterface:
     """Interface class for meshtastic devices
@@ -82,6 +100,7 @@ class MeshInterface:
         self.mask = None  # used in gpio read and gpio watch
         self.queueStatus = None
         self.queue = collections.OrderedDict()
+        self._packetCallbacks = []  # called directly for each received packet, see addPacketCallback()
 
     def close(self):
         """Shutdown this interface"""
@@ -223,6 +242,18 @@ class MeshInterface:
         print(table)
         return table
 
+    def addPacketCallback(self, callback):
+        """Call callback(packet, interface) for every packet received from the mesh
+
+        This is a cheaper alternative to subscribing to "meshtastic.receive", the
+        callback is invoked directly (on the publishing thread) without going
+        through pubsub."""
+        self._packetCallbacks.append(callback)
+
+    def removePacketCallback(self, callback):
+        """Stop calling a callback registered with addPacketCallback()"""
+        self._packetCallbacks.remove(callback)
+
     def getNode(self, nodeId, requestChannels=True):
         """Return a node object which contains device settings and channel info"""
         if nodeId in (LOCAL_ADDR, BROADCAST_ADDR):
@@ -263,7 +294,8 @@ class MeshInterface:
                             send an application layer response
 
         Returns the sent packet. The id field will be populated in this packet
-        and can be used to track future message acks/naks.
+        and can be used to track future message acks/naks.  This is the very packet
+        queued for sending (and any retransmission), so do not modify it.
         """
 
         return self.sendData(
@@ -306,16 +338,18 @@ class MeshInterface:
             channelIndex - channel number to use
 
         Returns the sent packet. The id field will be populated in this packet
-        and can be used to track future message acks/naks.
+        and can be used to track future message acks/naks.  This is the very packet
+        queued for sending (and any retransmission), so do not modify it.
         """
 
         if getattr(data, "SerializeToString", None):
-            logging.debug(f"Serializing protobuf as data: {stripnl(data)}")
+            if logging.root.isEnabledFor(logging.DEBUG):
+                logging.debug("Serializing protobuf as data: %s", stripnl(data))
             data = data.SerializeToString()
 
-        logging.debug(f"len(data): {len(data)}")
+        logging.debug("len(data): %s", len(data))
         logging.debug(
-            f"mesh_pb2.Constants.DATA_PAYLOAD_LEN: {mesh_pb2.Constants.DATA_PAYLOAD_LEN}"
+            "mesh_pb2.Constants.DATA_PAYLOAD_LEN: %s", mesh_pb2.Constants.DATA_PAYLOAD_LEN
         )
         if len(data) > mesh_pb2.Constants.DATA_PAYLOAD_LEN:
             raise MeshInterface.MeshInterfaceError("Data payload too big")
@@ -325,7 +359,9 @@ class MeshInterface:
         ):  # we are now more strict wrt port numbers
             our_exit("Warning: A non-zero port number must be specified")
 
-        meshPacket = mesh_pb2.MeshPacket()
+        # Build the packet directly inside the ToRadio we will send, so it never has to be copied
+        toRadio = _ToRadio()
+        meshPacket = toRadio.packet
         meshPacket.channel = channelIndex
         meshPacket.decoded.payload = data
         meshPacket.decoded.portnum = portNum
@@ -334,7 +370,7 @@ class MeshInterface:
 
         if onResponse is not None:
             self._addResponseHandler(meshPacket.id, onResponse)
-        p = self._sendPacket(meshPacket, destinationId, wantAck=wantAck)
+        p = self._sendPacketInPlace(toRadio, destinationId, wantAck=wantAck)
         return p
 
     def sendPosition(
@@ -485,16 +521,35 @@ class MeshInterface:
         """Send a MeshPacket to the specified node (or if unspecified, broadcast).
         You probably don't want this - use sendData instead.
 
+        meshPacket is copied into the ToRadio we send, see _sendPacketInPlace() to avoid that.
+
         Returns the sent packet. The id field will be populated in this packet and
         can be used to track future message acks/naks.
         """
+        self._addressPacket(meshPacket, destinationId, wantAck)
+        toRadio = _ToRadio()
+        toRadio.packet.CopyFrom(meshPacket)
+        self._sendAddressedPacket(toRadio)
+        return meshPacket
+
+    def _sendPacketInPlace(self, toRadio, destinationId=BROADCAST_ADDR, wantAck=False):
+        """Like _sendPacket(), but for a MeshPacket that was built directly in toRadio.packet,
+        so it can be sent without being copied.
+
+        Returns the sent packet (toRadio.packet).  It is not a copy: it stays part of the
+        ToRadio that _sendToRadio() may queue for retransmission.
+        """
+        meshPacket = toRadio.packet
+        self._addressPacket(meshPacket, destinationId, wantAck)
+        self._sendAddressedPacket(toRadio)
+        return meshPacket
 
+    def _addressPacket(self, meshPacket, destinationId, wantAck):
+        """Fill in the destination, hop limit and (if not set yet) id of a MeshPacket we are about to send"""
         # We allow users to talk to the local node before we've completed the full connection flow...
         if self.myInfo is not None and destinationId != self.myInfo.my_node_num:
             self._waitConnected()
 
-        toRadio = mesh_pb2.ToRadio()
-
         nodeNum = 0
         if destinationId is None:
             our_exit("Warning: destinationId must not be None")
@@ -530,15 +585,17 @@ class MeshInterface:
         if meshPacket.id == 0:
             meshPacket.id = self._generatePacketId()
 
-        toRadio.packet.CopyFrom(meshPacket)
+    def _sendAddressedPacket(self, toRadio):
+        """Send a ToRadio holding a MeshPacket filled in by _addressPacket()"""
         if self.noProto:
             logging.warning(
                 f"Not sending packet because protocol use is disabled by noProto"
             )
         else:
-            logging.debug(f"Sending packet: {stripnl(meshPacket)}")
+            # stripnl() formats the whole protobuf, so skip it unless someone will see the result
+            if logging.root.isEnabledFor(logging.DEBUG):
+                logging.debug("Sending packet: %s", stripnl(toRadio.packet))
             self._sendToRadio(toRadio)
-        return meshPacket
 
     def waitForConfig(self):
         """Block until radio config is received. Returns True if config has been received."""
@@ -618,7 +675,7 @@ class MeshInterface:
         """Called by subclasses to tell clients this interface has disconnected"""
         self.isConnected.clear()
         publishingThread.queueWork(
-            lambda: pub.sendMessage("meshtastic.connection.lost", interface=self)
+            lambda: _getTopic("meshtastic.connection.lost").publish(interface=self)
         )
 
     def _startHeartbeat(self):
@@ -632,7 +689,7 @@ class MeshInterface:
             if i != 0:
                 self.heartbeatTimer = threading.Timer(i, callback)
                 self.heartbeatTimer.start()
-                p = mesh_pb2.ToRadio()
+                p = _ToRadio()
                 self._sendToRadio(p)
 
         callback()  # run our periodic callback now, it will make another timer if necessary
@@ -646,8 +703,8 @@ class MeshInterface:
             self.isConnected.set()
             self._startHeartbeat()
             publishingThread.queueWork(
-                lambda: pub.sendMessage(
-                    "meshtastic.connection.established", interface=self
+                lambda: _getTopic("meshtastic.connection.established").publish(
+                    interface=self
                 )
             )
 
@@ -657,14 +714,14 @@ class MeshInterface:
         self.nodes = {}  # nodes keyed by ID
         self.nodesByNum = {}  # nodes keyed by nodenum
 
-        startConfig = mesh_pb2.ToRadio()
+        startConfig = _ToRadio()
         self.configId = random.randint(0, 0xFFFFFFFF)
         startConfig.want_config_id = self.configId
         self._sendToRadio(startConfig)
 
     def _sendDisconnect(self):
         """Tell device we are done using it"""
-        m = mesh_pb2.ToRadio()
+        m = _ToRadio()
         m.disconnect = True
         self._sendToRadio(m)
 
@@ -714,7 +771,7 @@ class MeshInterface:
                     continue
                 self._queueClaim()
                 if packet != toRadio:
-                    logging.debug(f"Resending packet ID {packetId:08x} {packet}")
+                    logging.debug("Resending packet ID %08x %s", packetId, packet)
                 self._sendToRadioImpl(packet)
 
             # logging.warn("resentQueue: " + " ".join(f'{k:08x}' for k in resentQueue))
@@ -722,7 +779,7 @@ class MeshInterface:
                 if (
                     self.queue.pop(packetId, False) is False
                 ):  # Packet got acked under us
-                    logging.debug(f"packet {packetId:08x} got acked under us")
+                    logging.debug("packet %08x got acked under us", packetId)
                     continue
                 if packet:
                     self.queue[packetId] = packet
@@ -730,7 +787,7 @@ class MeshInterface:
 
     def _sendToRadioImpl(self, toRadio):
         """Send a ToRadio protobuf to the device"""
-        logging.error(f"Subclass must provide toradio: {toRadio}")
+        logging.error("Subclass must provide toradio: %s", toRadio)
 
     def _handleConfigComplete(self):
         """
@@ -763,132 +820,104 @@ class MeshInterface:
         Handle a packet that arrived from the radio(update model and publish events)
 
         Called by subclasses."""
-        fromRadio = mesh_pb2.FromRadio()
+        fromRadio = _FromRadio()
         fromRadio.ParseFromString(fromRadioBytes)
+        # Use lazy % formatting, so we only pay for the text conversion if debug logging is on
         logging.debug(
-            f"in mesh_interface.py _handleFromRadio() fromRadioBytes: {fromRadioBytes}"
+            "in mesh_interface.py _handleFromRadio() fromRadioBytes: %s", fromRadioBytes
         )
-        asDict = google.protobuf.json_format.MessageToDict(fromRadio)
-        logging.debug(f"Received from radio: {fromRadio}")
-        if fromRadio.HasField("my_info"):
-            self.myInfo = fromRadio.my_info
-            self.localNode.nodeNum = self.myInfo.my_node_num
-            logging.debug(f"Received myinfo: {stripnl(fromRadio.my_info)}")
-
-            failmsg = None
-
-            if failmsg:
-                self.failure = MeshInterface.MeshInterfaceError(failmsg)
-                self.isConnected.set()  # let waitConnected return this exception
-                self.close()
-
-        elif fromRadio.HasField("metadata"):
-            self.metadata = fromRadio.metadata
-            logging.debug(f"Received device metadata: {stripnl(fromRadio.metadata)}")
-
-        elif fromRadio.HasField("node_info"):
-            node = asDict["nodeInfo"]
-            try:
-                newpos = self._fixupPosition(node["position"])
-                node["position"] = newpos
-            except:
-                logging.debug("Node without position")
+        logging.debug("Received from radio: %s", fromRadio)
+
+        # A single WhichOneof call tells us which variant we got, rather than
+        # probing each field in turn with HasField
+        which = fromRadio.WhichOneof("payload_variant")
+        handlerName = MeshInterface._FROM_RADIO_HANDLERS.get(which)
+        if handlerName is not None:
+            # looked up by name, so subclasses can override individual handlers
+            getattr(self, handlerName)(getattr(fromRadio, which))
+        else:
+            logging.debug("Unexpected FromRadio payload")
 
-            logging.debug(f"Received nodeinfo: {node}")
+    def _handleMyInfoFromRadio(self, myInfo):
+        self.myInfo = myInfo
+        self.localNode.nodeNum = self.myInfo.my_node_num
+        logging.debug(f"Received myinfo: {stripnl(myInfo)}")
 
-            self.nodesByNum[node["num"]] = node
-            if "user" in node:  # Some nodes might not have user/ids assigned yet
-                if "id" in node["user"]:
-                    self.nodes[node["user"]["id"]] = node
-            publishingThread.queueWork(
-                lambda: pub.sendMessage(
-                    "meshtastic.node.updated", node=node, interface=self
-                )
+        failmsg = None
+
+        if failmsg:
+            self.failure = MeshInterface.MeshInterfaceError(failmsg)
+            self.isConnected.set()  # let waitConnected return this exception
+            self.close()
+
+    def _handleMetadataFromRadio(self, metadata):
+        self.metadata = metadata
+        logging.debug(f"Received device metadata: {stripnl(metadata)}")
+
+    def _handleNodeInfoFromRadio(self, nodeInfo):
+        node = google.protobuf.json_format.MessageToDict(nodeInfo)
+        try:
+            newpos = self._fixupPosition(node["position"])
+            node["position"] = newpos
+        except:
+            logging.debug("Node without position")
+
+        logging.debug(f"Received nodeinfo: {node}")
+
+        self.nodesByNum[node["num"]] = node
+        if "user" in node:  # Some nodes might not have user/ids assigned yet
+            if "id" in node["user"]:
+                self.nodes[node["user"]["id"]] = node
+        publishingThread.queueWork(
+            lambda: _getTopic("meshtastic.node.updated").publish(
+                node=node, interface=self
             )
-        elif fromRadio.config_complete_id == self.configId:
+        )
+
+    def _handleConfigCompleteFromRadio(self, configCompleteId):
+        if configCompleteId == self.configId:
             # we ignore the config_complete_id, it is unneeded for our
             # stream API fromRadio.config_complete_id
             logging.debug(f"Config complete ID {self.configId}")
             self._handleConfigComplete()
+        else:
+            logging.debug(f"Ignoring config complete ID {configCompleteId}")
 
-        elif fromRadio.HasField("packet"):
-            self._handlePacketFromRadio(fromRadio.packet)
-
-        elif fromRadio.HasField("queueStatus"):
-            self._handleQueueStatusFromRadio(fromRadio.queueStatus)
-
-        elif fromRadio.rebooted:
+    def _handleRebootedFromRadio(self, rebooted):
+        if rebooted:
             # Tell clients the device went away.  Careful not to call the overridden
             # subclass version that closes the serial port
             MeshInterface._disconnected(self)
 
             self._startConfig()  # redownload the node db etc...
 
-        elif fromRadio.config or fromRadio.moduleConfig:
-            if fromRadio.config.HasField("device"):
-                self.localNode.localConfig.device.CopyFrom(fromRadio.config.device)
-            elif fromRadio.config.HasField("position"):
-                self.localNode.localConfig.position.CopyFrom(fromRadio.config.position)
-            elif fromRadio.config.HasField("power"):
-                self.localNode.localConfig.power.CopyFrom(fromRadio.config.power)
-            elif fromRadio.config.HasField("network"):
-                self.localNode.localConfig.network.CopyFrom(fromRadio.config.network)
-            elif fromRadio.config.HasField("display"):
-                self.localNode.localConfig.display.CopyFrom(fromRadio.config.display)
-            elif fromRadio.config.HasField("lora"):
-                self.localNode.localConfig.lora.CopyFrom(fromRadio.config.lora)
-            elif fromRadio.config.HasField("bluetooth"):
-                self.localNode.localConfig.bluetooth.CopyFrom(
-                    fromRadio.config.bluetooth
-                )
-
-            elif fromRadio.moduleConfig.HasField("mqtt"):
-                self.localNode.moduleConfig.mqtt.CopyFrom(fromRadio.moduleConfig.mqtt)
-            elif fromRadio.moduleConfig.HasField("serial"):
-                self.localNode.moduleConfig.serial.CopyFrom(
-                    fromRadio.moduleConfig.serial
-                )
-            elif fromRadio.moduleConfig.HasField("external_notification"):
-                self.localNode.moduleConfig.external_notification.CopyFrom(
-                    fromRadio.moduleConfig.external_notification
-                )
-            elif fromRadio.moduleConfig.HasField("range_test"):
-                self.localNode.moduleConfig.range_test.CopyFrom(
-                    fromRadio.moduleConfig.range_test
-                )
-            elif fromRadio.moduleConfig.HasField("telemetry"):
-                self.localNode.moduleConfig.telemetry.CopyFrom(
-                    fromRadio.moduleConfig.telemetry
-                )
-            elif fromRadio.moduleConfig.HasField("canned_message"):
-                self.localNode.moduleConfig.canned_message.CopyFrom(
-                    fromRadio.moduleConfig.canned_message
-                )
-            elif fromRadio.moduleConfig.HasField("audio"):
-                self.localNode.moduleConfig.audio.CopyFrom(fromRadio.moduleConfig.audio)
-            elif fromRadio.moduleConfig.HasField("remote_hardware"):
-                self.localNode.moduleConfig.remote_hardware.CopyFrom(
-                    fromRadio.moduleConfig.remote_hardware
-                )
-            elif fromRadio.moduleConfig.HasField("neighbor_info"):
-                self.localNode.moduleConfig.neighbor_info.CopyFrom(
-                    fromRadio.moduleConfig.neighbor_info
-                )
-            elif fromRadio.moduleConfig.HasField("detection_sensor"):
-                self.localNode.moduleConfig.detection_sensor.CopyFrom(
-                    fromRadio.moduleConfig.detection_sensor
-                )
-            elif fromRadio.moduleConfig.HasField("ambient_lighting"):
-                self.localNode.moduleConfig.ambient_lighting.CopyFrom(
-                    fromRadio.moduleConfig.ambient_lighting
-                )
-            elif fromRadio.moduleConfig.HasField("paxcounter"):
-                self.localNode.moduleConfig.paxcounter.CopyFrom(
-                    fromRadio.moduleConfig.paxcounter
-                )
+    def _handleConfigFromRadio(self, config):
+        # The Config oneof variants have the same names as the LocalConfig fields
+        which = config.WhichOneof("payload_variant")
+        if which is not None:
+            getattr(self.localNode.localConfig, which).CopyFrom(getattr(config, which))
+
+    def _handleModuleConfigFromRadio(self, moduleConfig):
+        # The ModuleConfig oneof variants have the same names as the LocalModuleConfig fields
+        which = moduleConfig.WhichOneof("payload_variant")
+        if which is not None:
+            getattr(self.localNode.moduleConfig, which).CopyFrom(
+                getattr(moduleConfig, which)
+            )
 
-        else:
-            logging.debug("Unexpected FromRadio payload")
+    _FROM_RADIO_HANDLERS = {
+        "my_info": "_handleMyInfoFromRadio",
+        "metadata": "_handleMetadataFromRadio",
+        "node_info": "_handleNodeInfoFromRadio",
+        "config_complete_id": "_handleConfigCompleteFromRadio",
+        "packet": "_handlePacketFromRadio",
+        "queueStatus": "_handleQueueStatusFromRadio",
+        "rebooted": "_handleRebootedFromRadio",
+        "config": "_handleConfigFromRadio",
+        "moduleConfig": "_handleModuleConfigFromRadio",
+    }
+    """Maps each FromRadio payload_variant we understand to the name of the method
+    handling it, which is called with the value of that variant"""
 
     def _fixupPosition(self, position):
         """Convert integer lat/lon into floats
@@ -915,23 +944,67 @@ class MeshInterface:
         if num == BROADCAST_NUM:
             return BROADCAST_ADDR
 
-        try:
-            return self.nodesByNum[num]["user"]["id"]
-        except:
-            logging.debug(f"Node {num} not found for fromId")
-            return None
+        # this runs twice per received packet, so use plain lookups rather than
+        # a try/except (which also used to swallow KeyboardInterrupt)
+        node = self.nodesByNum.get(num) if self.nodesByNum else None
+        if node is not None:
+            nodeId = node.get("user", {}).get("id")
+            if nodeId is not None:
+                return nodeId
+        logging.debug(f"Node {num} not found for fromId")
+        return None
 
     def _getOrCreateByNum(self, nodeNum):
         """Given a nodenum find the NodeInfo in the DB (or create if necessary)"""
         if nodeNum == BROADCAST_NUM:
             raise MeshInterface.MeshInterfaceError("Can not create/find nodenum by the broadcast num")
 
-        if nodeNum in self.nodesByNum:
-            return self.nodesByNum[nodeNum]
-        else:
+        n = self.nodesByNum.get(nodeNum)
+        if n is None:
             n = {"num": nodeNum}  # Create a minimal node db entry
             self.nodesByNum[nodeNum] = n
-            return n
+        return n
+
+    def _hasListeners(self, topic):
+        """Return True if anyone is subscribed to topic or to one of its parent topics"""
+        t = _getTopic(topic)
+        while t is not None:  # the root of the topic tree has no parent
+            if t.hasListeners():
+                return True
+            t = t.getParent()
+        return False
+
+    def _packetRoute(self, meshPacket):
+        """Work out where a received MeshPacket goes, straight from the protobuf
+
+        Returns a tuple of (topic name, KnownProtocol or None)"""
+        if not meshPacket.HasField("decoded"):
+            return "meshtastic.receive", None  # Generic unknown packet type
+
+        portNumInt = meshPacket.decoded.portnum
+        protocol = protocols.get(portNumInt)
+        if protocol is not None:
+            return f"meshtastic.receive.{protocol.name}", protocol
+
+        try:
+            portnum = portnums_pb2.PortNum.Name(portNumInt)
+        except ValueError:
+            portnum = portNumInt  # not a well known portnum
+        return f"meshtastic.receive.data.{portnum}", None
+
+    def _packetDictWanted(self, meshPacket, topic, protocol):
+        """Return True if anything will consume the dictionary version of this
+        received MeshPacket"""
+        if self._packetCallbacks:
+            return True
+        if protocol is not None and protocol.onReceive is not None:
+            return True  # needed to update our node DB
+        if (
+            meshPacket.HasField("decoded")
+            and meshPacket.decoded.request_id in self.responseHandlers
+        ):
+            return True
+        return self._hasListeners(topic)
 
     def _handlePacketFromRadio(self, meshPacket, hack=False):
         """Handle a MeshPacket that just arrived from the radio
@@ -949,15 +1022,9 @@ class MeshInterface:
         - meshtastic.receive.user(packet = MeshPacket dictionary)
         - meshtastic.receive.data(packet = MeshPacket dictionary)
         """
-        asDict = google.protobuf.json_format.MessageToDict(meshPacket)
-
-        # We normally decompose the payload into a dictionary so that the client
-        # doesn't need to understand protobufs.  But advanced clients might
-        # want the raw protobuf, so we provide it in "raw"
-        asDict["raw"] = meshPacket
-
         # from might be missing if the nodenum was zero.
-        if not hack and "from" not in asDict:
+        if not hack and getattr(meshPacket, "from") == 0:
+            asDict = google.protobuf.json_format.MessageToDict(meshPacket)
             asDict["from"] = 0
             logging.error(
                 f"Device returned a packet we sent, ignoring: {stripnl(asDict)}"
@@ -966,6 +1033,22 @@ class MeshInterface:
                 f"Error: Device returned a packet we sent, ignoring: {stripnl(asDict)}"
             )
             return
+
+        # Converting to a dictionary is the most expensive part of receiving a packet,
+        # so skip it if no one (a protocol handler, a response handler or a subscriber)
+        # is going to look at the result.
+        topic, protocol = self._packetRoute(meshPacket)
+        if not self._packetDictWanted(meshPacket, topic, protocol):
+            logging.debug("No one wants this packet, not decoding it")
+            return
+
+        asDict = google.protobuf.json_format.MessageToDict(meshPacket)
+
+        # We normally decompose the payload into a dictionary so that the client
+        # doesn't need to understand protobufs.  But advanced clients might
+        # want the raw protobuf, so we provide it in "raw"
+        asDict["raw"] = meshPacket
+
         if "to" not in asDict:
             asDict["to"] = 0
 
@@ -981,8 +1064,6 @@ class MeshInterface:
 
         # We could provide our objects as DotMaps - which work with . notation or as dictionaries
         # asObj = DotMap(asDict)
-        topic = "meshtastic.receive"  # Generic unknown packet type
-
         decoded = None
         portnum = portnums_pb2.PortNum.Name(portnums_pb2.PortNum.UNKNOWN_APP)
         if "decoded" in asDict:
@@ -998,33 +1079,25 @@ class MeshInterface:
             if "portnum" not in decoded:
                 decoded["portnum"] = portnum
                 logging.warning(f"portnum was not in decoded. Setting to:{portnum}")
-            else:
-                portnum = decoded["portnum"]
-
-            topic = f"meshtastic.receive.data.{portnum}"
 
             # decode position protobufs and update nodedb, provide decoded version
-            # as "position" in the published msg move the following into a 'decoders'
-            # API that clients could register?
-            portNumInt = meshPacket.decoded.portnum  # we want portnum as an int
-            handler = protocols.get(portNumInt)
+            # as "position" in the published msg (protocol was looked up in
+            # _packetRoute() from the integer portnum)
             # The decoded protobuf as a dictionary (if we understand this message)
             p = None
-            if handler is not None:
-                topic = f"meshtastic.receive.{handler.name}"
-
+            if protocol is not None:
                 # Convert to protobuf if possible
-                if handler.protobufFactory is not None:
-                    pb = handler.protobufFactory()
+                if protocol.protobufFactory is not None:
+                    pb = protocol.protobufFactory()
                     pb.ParseFromString(meshPacket.decoded.payload)
                     p = google.protobuf.json_format.MessageToDict(pb)
-                    asDict["decoded"][handler.name] = p
+                    asDict["decoded"][protocol.name] = p
                     # Also provide the protobuf raw
-                    asDict["decoded"][handler.name]["raw"] = pb
+                    asDict["decoded"][protocol.name]["raw"] = pb
 
                 # Call specialized onReceive if necessary
-                if handler.onReceive is not None:
-                    handler.onReceive(self, asDict)
+                if protocol.onReceive is not None:
+                    protocol.onReceive(self, asDict)
 
             # Is this message in response to a request, if so, look for a handler
             requestId = decoded.get("requestId")
@@ -1039,7 +1112,22 @@ class MeshInterface:
                         if not isAck or (isAck and handler.__name__ == "onAckNak"):
                             handler.callback(asDict)
 
-        logging.debug(f"Publishing {topic}: packet={stripnl(asDict)} ")
-        publishingThread.queueWork(
-            lambda: pub.sendMessage(topic, packet=asDict, interface=self)
-        )
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug("Publishing %s: packet=%s ", topic, stripnl(asDict))
+        topicObj = _getTopic(topic)
+        callbacks = list(self._packetCallbacks)
+
+        def publish():
+            # Each consumer gets its own try, so one that fails can not keep the
+            # packet from the others
+            try:
+                topicObj.publish(packet=asDict, interface=self)
+            except Exception:
+                logging.exception(f"Error in a pubsub listener for {topic}")
+            for callback in callbacks:
+                try:
+                    callback(asDict, self)
+                except Exception:
+                    logging.exception(f"Error in packet callback {callback}")
+
+        publishingThread.queueWork(publish)
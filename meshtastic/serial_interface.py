@@ -13,6 +13,39 @@ if platform.system() != "Windows":
     import termios
 
 
+def findSerialDevPath():
+    """Probe for the serial port of our Meshtastic device
+
+    Returns the port, or None (after telling the user we will try TCP instead) if no
+    device was found.  Exits if there are several, as we can not tell which one to use.
+    """
+    ports = meshtastic.util.findPorts(True)
+    logging.debug(f"ports:{ports}")
+    if len(ports) == 0:
+        print("No Serial Meshtastic device detected, attempting TCP connection on localhost.")
+        return None
+    if len(ports) > 1:
+        message = "Warning: Multiple serial ports were detected so one serial port must be specified with the '--port'.\n"
+        message += f"  Ports detected:{ports}"
+        meshtastic.util.our_exit(message)
+    return ports[0]
+
+
+def clearHupcl(devPath):
+    """Clear HUPCL on a serial port, so the device will not reboot based on RTS and/or DTR
+    when we open it
+
+    see https://github.com/pyserial/pyserial/issues/124
+    """
+    if platform.system() != "Windows":
+        with open(devPath, encoding="utf8") as f:
+            attrs = termios.tcgetattr(f)
+            attrs[2] = attrs[2] & ~termios.HUPCL
+            termios.tcsetattr(f, termios.TCSAFLUSH, attrs)
+            f.close()
+        time.sleep(0.1)
+
+
 class SerialInterface(StreamInterface):
     """Interface class for meshtastic devices over a serial link"""
 
@@ -29,29 +62,14 @@ class SerialInterface(StreamInterface):
         self.devPath = devPath
 
         if self.devPath is None:
-            ports = meshtastic.util.findPorts(True)
-            logging.debug(f"ports:{ports}")
-            if len(ports) == 0:
-                print("No Serial Meshtastic device detected, attempting TCP connection on localhost.")
+            self.devPath = findSerialDevPath()
+            if self.devPath is None:
                 return
-            elif len(ports) > 1:
-                message = "Warning: Multiple serial ports were detected so one serial port must be specified with the '--port'.\n"
-                message += f"  Ports detected:{ports}"
-                meshtastic.util.our_exit(message)
-            else:
-                self.devPath = ports[0]
 
         logging.debug(f"Connecting to {self.devPath}")
 
         # first we need to set the HUPCL so the device will not reboot based on RTS and/or DTR
-        # see https://github.com/pyserial/pyserial/issues/124
-        if platform.system() != "Windows":
-            with open(self.devPath, encoding="utf8") as f:
-                attrs = termios.tcgetattr(f)
-                attrs[2] = attrs[2] & ~termios.HUPCL
-                termios.tcsetattr(f, termios.TCSAFLUSH, attrs)
-                f.close()
-            time.sleep(0.1)
+        clearHupcl(self.devPath)
 
         self.stream = serial.Serial(
             self.devPath, 115200, exclusive=True, timeout=0.5, write_timeout=0
@@ -7,13 +7,18 @@ import traceback
 
 import serial
 
+from meshtastic.frame_parser import (  # pylint: disable=W0611
+    HEADER_LEN,
+    HEADER_STRUCT,
+    MAX_TO_FROM_RADIO_SIZE,
+    START1,
+    START2,
+    WAKE_BYTES,
+    FrameParser,
+    encodeToRadio,
+)
 from meshtastic.mesh_interface import MeshInterface
-from meshtastic.util import is_windows11, stripnl
-
-START1 = 0x94
-START2 = 0xC3
-HEADER_LEN = 4
-MAX_TO_FROM_RADIO_SIZE = 512
+from meshtastic.util import is_windows11
 
 
 class StreamInterface(MeshInterface):
@@ -35,7 +40,7 @@ class StreamInterface(MeshInterface):
             raise Exception( # pylint: disable=W0719
                 "StreamInterface is now abstract (to update existing code create SerialInterface instead)"
             )
-        self._rxBuf = bytes()  # empty
+        self._frameParser = FrameParser(debugOut=debugOut)
         self._wantExit = False
 
         self.is_windows11 = is_windows11()
@@ -58,12 +63,8 @@ class StreamInterface(MeshInterface):
         passed in connectNow=False you can manually start the reading thread later.
         """
 
-        # Send some bogus UART characters to force a sleeping device to wake, and
-        # if the reading statemachine was parsing a bad packet make sure
-        # we write enough start bytes to force it to resync (we don't use START1
-        # because we want to ensure it is looking for START1)
-        p = bytearray([START2] * 32)
-        self._writeBytes(p)
+        # Wake a sleeping device and force its parser to resync
+        self._writeBytes(WAKE_BYTES)
         time.sleep(0.1)  # wait 100ms to give device time to start running
 
         self._rxThread.start()
@@ -86,9 +87,19 @@ class StreamInterface(MeshInterface):
             self.stream = None
 
     def _writeBytes(self, b):
-        """Write an array of bytes to our stream and flush"""
+        """Write an array of bytes to our stream and flush
+
+        Callers should pass a whole frame (header and payload) in one call, so
+        the device never sees a partial packet."""
         if self.stream:  # ignore writes when stream is closed
-            self.stream.write(b)
+            # we open serial ports with write_timeout=0 (non-blocking), so write()
+            # may only take part of the frame and returns how much it took; keep
+            # going until all of it is out (streams returning None took everything)
+            written = self.stream.write(b)
+            while isinstance(written, int) and written < len(b):
+                b = b[written:]
+                self.stream.flush()  # let the port drain before writing the rest
+                written = self.stream.write(b)
             self.stream.flush()
             # win11 might need a bit more time, too
             if self.is_windows11:
@@ -104,15 +115,17 @@ class StreamInterface(MeshInterface):
         else:
             return None
 
+    def _readAvailable(self):
+        """Read all bytes already waiting in our stream, or block (until the
+        read timeout) for at least one byte if there are none"""
+        if self.stream:
+            return self.stream.read(self.stream.in_waiting or 1)
+        else:
+            return None
+
     def _sendToRadioImpl(self, toRadio):
         """Send a ToRadio protobuf to the device"""
-        logging.debug(f"Sending: {stripnl(toRadio)}")
-        b = toRadio.SerializeToString()
-        bufLen = len(b)
-        # We convert into a string, because the TCP code doesn't work with byte arrays
-        header = bytes([START1, START2, (bufLen >> 8) & 0xFF, bufLen & 0xFF])
-        logging.debug(f"sending header:{header} b:{b}")
-        self._writeBytes(header + b)
+        self._writeBytes(encodeToRadio(toRadio))
 
     def close(self):
         """Close a connection to the device"""
@@ -127,56 +140,19 @@ class StreamInterface(MeshInterface):
     def __reader(self):
         """The reader thread that reads bytes from our stream"""
         logging.debug("in __reader()")
-        empty = bytes()
 
         try:
             while not self._wantExit:
-                # logging.debug("reading character")
-                b = self._readBytes(1)
-                # logging.debug("In reader loop")
-                # logging.debug(f"read returned {b}")
+                b = self._readAvailable()
                 if len(b) > 0:
-                    c = b[0]
-                    # logging.debug(f'c:{c}')
-                    ptr = len(self._rxBuf)
-
-                    # Assume we want to append this byte, fixme use bytearray instead
-                    self._rxBuf = self._rxBuf + b
-
-                    if ptr == 0:  # looking for START1
-                        if c != START1:
-                            self._rxBuf = empty  # failed to find start
-                            if self.debugOut is not None:
-                                try:
-                                    self.debugOut.write(b.decode("utf-8"))
-                                except:
-                                    self.debugOut.write("?")
-
-                    elif ptr == 1:  # looking for START2
-                        if c != START2:
-                            self._rxBuf = empty  # failed to find start2
-                    elif ptr >= HEADER_LEN - 1:  # we've at least got a header
-                        # logging.debug('at least we received a header')
-                        # big endian length follows header
-                        packetlen = (self._rxBuf[2] << 8) + self._rxBuf[3]
-
-                        if (
-                            ptr == HEADER_LEN - 1
-                        ):  # we _just_ finished reading the header, validate length
-                            if packetlen > MAX_TO_FROM_RADIO_SIZE:
-                                self._rxBuf = (
-                                    empty  # length was out out bounds, restart
-                                )
-
-                        if len(self._rxBuf) != 0 and ptr + 1 >= packetlen + HEADER_LEN:
-                            try:
-                                self._handleFromRadio(self._rxBuf[HEADER_LEN:])
-                            except Exception as ex:
-                                logging.error(
-                                    f"Error while handling message from radio {ex}"
-                                )
-                                traceback.print_exc()
-                            self._rxBuf = empty
+                    for payload in self._frameParser.feed(b):
+                        try:
+                            self._handleFromRadio(payload)
+                        except Exception as ex:
+                            logging.error(
+                                f"Error while handling message from radio {ex}"
+                            )
+                            traceback.print_exc()
                 else:
                     # logging.debug(f"timeout")
                     pass
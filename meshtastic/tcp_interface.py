@@ -4,7 +4,11 @@ import logging
 import socket
 from typing import AnyStr
 
-from meshtastic.stream_interface import StreamInterface
+from meshtastic.stream_interface import (
+    HEADER_LEN,
+    MAX_TO_FROM_RADIO_SIZE,
+    StreamInterface,
+)
 
 
 class TCPInterface(StreamInterface):
@@ -68,9 +72,14 @@ class TCPInterface(StreamInterface):
             self.socket.close()
 
     def _writeBytes(self, b):
-        """Write an array of bytes to our stream and flush"""
-        self.socket.send(b)
+        """Write an array of bytes to our stream"""
+        # send() may only write part of a frame, sendall() keeps going until it is all out
+        self.socket.sendall(b)
 
     def _readBytes(self, length):
         """Read an array of bytes from our stream"""
         return self.socket.recv(length)
+
+    def _readAvailable(self):
+        """Read whatever bytes are waiting on our socket"""
+        return self.socket.recv(HEADER_LEN + MAX_TO_FROM_RADIO_SIZE)
@@ -0,0 +1,103 @@
+"""Meshtastic unit tests for async_stream_interface.py"""
+
+import io
+import re
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import serial  # type: ignore[import-untyped]
+
+pytest.importorskip("serial_asyncio")
+
+# pylint: disable=C0413
+from ..async_stream_interface import AsyncStreamInterface
+from ..frame_parser import HEADER_STRUCT, START1, START2
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_AsyncStreamInterface_data_received():
+    """Test that received bytes are framed and handed to _handleFromRadio"""
+    debugOut = io.StringIO()
+    iface = AsyncStreamInterface(
+        devPath="/dev/null", debugOut=debugOut, noProto=True, connectNow=False
+    )
+    frame = HEADER_STRUCT.pack(START1, START2, 3) + b"abc"
+    with patch.object(iface, "_handleFromRadio") as mock_handle:
+        iface.data_received(b"hi" + frame[:5])
+        mock_handle.assert_not_called()
+        iface.data_received(frame[5:])
+        mock_handle.assert_called_once_with(b"abc")
+    assert debugOut.getvalue() == "hi"
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_AsyncStreamInterface_connection_lost():
+    """Test that losing the transport marks us disconnected"""
+    iface = AsyncStreamInterface(devPath="/dev/null", noProto=True, connectNow=False)
+    iface.connection_made(MagicMock())
+    iface.isConnected.set()
+    iface.connection_lost(None)
+    assert iface.transport is None
+    assert not iface.isConnected.is_set()
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+@patch("time.sleep")
+def test_AsyncStreamInterface_writeBytes_and_close(mock_sleep):
+    """Test that writes go to the transport on the loop thread and close() shuts everything down"""
+    iface = AsyncStreamInterface(devPath="/dev/null", noProto=True, connectNow=False)
+    transport = MagicMock()
+    transport.close.side_effect = lambda: iface.connection_lost(None)
+    iface._loopThread.start()
+    iface.connection_made(transport)
+    iface._writeBytes(b"abc")
+    mock_sleep.assert_called_with(0.1)
+    iface.close()
+    transport.write.assert_called_once_with(b"abc")
+    transport.close.assert_called_once()
+    assert iface.transport is None
+    assert not iface._loopThread.is_alive()
+    assert iface._loop.is_closed()
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_AsyncStreamInterface_close_without_connect():
+    """Test that close() releases the event loop even if we never connected"""
+    iface = AsyncStreamInterface(devPath="/dev/null", noProto=True, connectNow=False)
+    iface.close()
+    assert iface._loop.is_closed()
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+@patch("meshtastic.async_stream_interface.clearHupcl")
+def test_AsyncStreamInterface_connect_fails(mock_clearHupcl):
+    """Test that a port we can not open does not leave the loop thread running"""
+    iface = AsyncStreamInterface(devPath="/dev/ttyUSBfake", noProto=True, connectNow=False)
+    with patch(
+        "serial_asyncio.create_serial_connection",
+        new_callable=AsyncMock,
+        side_effect=serial.SerialException("busy"),
+    ) as mock_create:
+        with pytest.raises(serial.SerialException):
+            iface.connect()
+    mock_clearHupcl.assert_called_once_with("/dev/ttyUSBfake")
+    assert mock_create.call_args.kwargs["exclusive"] is True
+    assert not iface._loopThread.is_alive()
+    assert iface._loop.is_closed()
+
+
+@pytest.mark.unit
+@patch("meshtastic.util.findPorts", return_value=[])
+def test_AsyncStreamInterface_no_ports(mocked_findPorts, capsys):
+    """Test that with no ports we behave like SerialInterface"""
+    iface = AsyncStreamInterface(noProto=True)
+    mocked_findPorts.assert_called()
+    assert iface.devPath is None
+    out, err = capsys.readouterr()
+    assert re.search(r"No.*Meshtastic.*device.*detected", out, re.MULTILINE)
+    assert err == ""
@@ -0,0 +1,112 @@
+"""Meshtastic unit tests for frame_parser.py"""
+
+import io
+
+import pytest
+
+from .. import mesh_pb2
+from ..frame_parser import (
+    MAX_TO_FROM_RADIO_SIZE,
+    START1,
+    START2,
+    FrameParser,
+    encodeToRadio,
+)
+
+
+def add_header(b):
+    """Add header stuffs for radio"""
+    bufLen = len(b)
+    header = bytes([START1, START2, (bufLen >> 8) & 0xFF, bufLen & 0xFF])
+    return header + b
+
+
+@pytest.mark.unit
+def test_FrameParser_single_frame():
+    """Test that a complete frame yields its payload"""
+    parser = FrameParser()
+    assert parser.feed(add_header(b"hello")) == [b"hello"]
+
+
+@pytest.mark.unit
+def test_FrameParser_split_frames():
+    """Test frames split across and combined within feeds"""
+    parser = FrameParser()
+    data = add_header(b"first") + add_header(b"second")
+    assert not parser.feed(data[:3])
+    assert parser.feed(data[3:12]) == [b"first"]
+    assert parser.feed(data[12:]) == [b"second"]
+
+
+@pytest.mark.unit
+def test_FrameParser_byte_at_a_time():
+    """Test feeding one byte at a time"""
+    parser = FrameParser()
+    packets = []
+    for c in add_header(b"abc"):
+        packets.extend(parser.feed(bytes([c])))
+    assert packets == [b"abc"]
+
+
+@pytest.mark.unit
+def test_FrameParser_debug_output():
+    """Test that bytes outside of a frame go to debugOut"""
+    debugOut = io.StringIO()
+    parser = FrameParser(debugOut=debugOut)
+    assert parser.feed(b"boot\n" + add_header(b"x")) == [b"x"]
+    assert debugOut.getvalue() == "boot\n"
+
+
+@pytest.mark.unit
+def test_FrameParser_debug_output_split_utf8():
+    """Test that a multi byte utf-8 character split across feeds is decoded"""
+    debugOut = io.StringIO()
+    parser = FrameParser(debugOut=debugOut)
+    data = "°C\n".encode("utf-8")
+    parser.feed(data[:1])
+    parser.feed(data[1:])
+    assert debugOut.getvalue() == "°C\n"
+
+
+@pytest.mark.unit
+def test_FrameParser_bad_start2():
+    """Test that a START1 not followed by START2 is skipped"""
+    parser = FrameParser()
+    assert parser.feed(bytes([START1, 0x00]) + add_header(b"ok")) == [b"ok"]
+
+
+@pytest.mark.unit
+def test_FrameParser_too_long():
+    """Test that a frame with an out of bounds length is dropped"""
+    parser = FrameParser()
+    bufLen = MAX_TO_FROM_RADIO_SIZE + 1
+    header = bytes([START1, START2, (bufLen >> 8) & 0xFF, bufLen & 0xFF])
+    assert parser.feed(header + add_header(b"ok")) == [b"ok"]
+
+
+@pytest.mark.unit
+def test_FrameParser_payload_contains_start_bytes():
+    """Test that START1/START2 inside a payload are treated as data"""
+    debugOut = io.StringIO()
+    parser = FrameParser(debugOut=debugOut)
+    payload = bytes([START1, START2, START1, 0x00])
+    data = b"log\n" + add_header(payload) + b"more\n" + add_header(b"")
+    assert parser.feed(data) == [payload, b""]
+    assert debugOut.getvalue() == "log\nmore\n"
+
+
+@pytest.mark.unit
+def test_FrameParser_memoryview():
+    """Test that a memoryview is accepted as well as bytes"""
+    parser = FrameParser()
+    assert parser.feed(memoryview(add_header(b"mv"))) == [b"mv"]
+
+
+@pytest.mark.unit
+def test_encodeToRadio():
+    """Test that an encoded ToRadio is framed so FrameParser gets its payload back"""
+    toRadio = mesh_pb2.ToRadio()
+    toRadio.want_config_id = 42
+    frame = encodeToRadio(toRadio)
+    assert frame == add_header(toRadio.SerializeToString())
+    assert FrameParser().feed(frame) == [toRadio.SerializeToString()]
@@ -2,11 +2,18 @@
 
 import logging
 import re
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from meshtastic.__init__ import _onNodeInfoReceive, _onPositionReceive, _onTextReceive
+from meshtastic.__init__ import (
+    _onNodeInfoReceive,
+    _onPositionReceive,
+    _onTextReceive,
+    _haveProtobufCppExtension,
+    _receiveInfoUpdate,
+    _warnIfSlowProtobuf,
+)
 
 from ..globals import Globals
 from ..serial_interface import SerialInterface
@@ -55,3 +62,50 @@ def test_init_onNodeInfoReceive(caplog, iface_with_nodes):
     with caplog.at_level(logging.DEBUG):
         _onNodeInfoReceive(iface, packet)
     assert re.search(r"in _onNodeInfoReceive", caplog.text, re.MULTILINE)
+
+
+@pytest.mark.unit
+def test_init_receiveInfoUpdate():
+    """Test _receiveInfoUpdate updates the one shared node entry"""
+    iface = MagicMock()
+    node = {"num": 123}
+    iface._getOrCreateByNum.return_value = node
+    packet = {"from": 123, "rxTime": 1000, "rxSnr": 6.5, "hopLimit": 3}
+    _receiveInfoUpdate(iface, packet)
+    iface._getOrCreateByNum.assert_called_once_with(123)
+    assert node["lastReceived"] is packet
+    assert node["lastHeard"] == 1000
+    assert node["snr"] == 6.5
+    assert node["hopLimit"] == 3
+
+
+@pytest.mark.unit
+def test_init_warnIfSlowProtobuf(caplog):
+    """Test the slow protobuf warning goes to our logger, not through logging.warning()"""
+    with patch("meshtastic.api_implementation.Type", return_value="python"):
+        with patch("logging.warning") as mock_warning:
+            with caplog.at_level(logging.WARNING):
+                _warnIfSlowProtobuf()
+    mock_warning.assert_not_called()
+    assert [r.name.split(".")[0] for r in caplog.records] == ["meshtastic"]
+    assert re.search(r"slow 'python' protobuf", caplog.text)
+
+
+@pytest.mark.unit
+def test_init_warnIfSlowProtobuf_native(caplog):
+    """Test that a native protobuf implementation is not warned about"""
+    with patch("meshtastic.api_implementation.Type", return_value="upb"):
+        with caplog.at_level(logging.WARNING):
+            _warnIfSlowProtobuf()
+    assert caplog.text == ""
+
+
+@pytest.mark.unit
+def test_init_haveProtobufCppExtension():
+    """Test that we only ask for the cpp backend if its extension is installed"""
+    with patch("importlib.util.find_spec", return_value=MagicMock()):
+        assert _haveProtobufCppExtension()
+    with patch("importlib.util.find_spec", return_value=None):
+        assert not _haveProtobufCppExtension()
+    with patch("importlib.util.find_spec", side_effect=ModuleNotFoundError):
+        assert not _haveProtobufCppExtension()
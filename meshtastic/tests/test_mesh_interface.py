@@ -2,9 +2,11 @@
 
 import logging
 import re
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
+from pubsub import pub
 
 from .. import mesh_pb2
 from ..__init__ import BROADCAST_ADDR, LOCAL_ADDR
@@ -124,10 +126,99 @@ def test_handlePacketFromRadio_no_portnum(caplog):
     meshPacket = mesh_pb2.MeshPacket()
     meshPacket.decoded.payload = b""
     with caplog.at_level(logging.WARNING):
-        iface._handlePacketFromRadio(meshPacket, hack=True)
+        with patch.object(iface, "_hasListeners", return_value=True):
+            iface._handlePacketFromRadio(meshPacket, hack=True)
     assert re.search(r"Not populating fromId", caplog.text, re.MULTILINE)
 
 
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_handlePacketFromRadio_no_listeners():
+    """Test that we do not convert a packet to a dictionary if no one wants it"""
+    iface = MeshInterface(noProto=True)
+    meshPacket = mesh_pb2.MeshPacket()
+    meshPacket.decoded.payload = b""
+    meshPacket.decoded.portnum = 67  # TELEMETRY_APP, has no onReceive handler
+    with patch.object(iface, "_hasListeners", return_value=False):
+        with patch("google.protobuf.json_format.MessageToDict") as mock_to_dict:
+            iface._handlePacketFromRadio(meshPacket, hack=True)
+            mock_to_dict.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_addPacketCallback():
+    """Test that packet callbacks are called for received packets"""
+    iface = MeshInterface(noProto=True)
+    received = threading.Event()
+    packets = []
+
+    def onPacket(packet, interface):
+        packets.append((packet, interface))
+        received.set()
+
+    iface.addPacketCallback(onPacket)
+    meshPacket = mesh_pb2.MeshPacket()
+    meshPacket.decoded.payload = b"hello"
+    meshPacket.decoded.portnum = 1
+    iface._handlePacketFromRadio(meshPacket, hack=True)
+    assert received.wait(5)
+    packet, interface = packets[0]
+    assert packet["decoded"]["text"] == "hello"
+    assert interface is iface
+    iface.removePacketCallback(onPacket)
+    assert not iface._packetCallbacks
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_packetCallback_errors_are_isolated(caplog):
+    """Test that a failing listener or callback does not starve the other callbacks"""
+    iface = MeshInterface(noProto=True)
+    received = threading.Event()
+
+    def badListener(packet, interface):  # pylint: disable=W0613
+        raise ValueError("listener")
+
+    def badCallback(packet, interface):  # pylint: disable=W0613
+        raise ValueError("callback")
+
+    def goodCallback(packet, interface):  # pylint: disable=W0613
+        received.set()
+
+    pub.subscribe(badListener, "meshtastic.receive.text")
+    iface.addPacketCallback(badCallback)
+    iface.addPacketCallback(goodCallback)
+    meshPacket = mesh_pb2.MeshPacket()
+    meshPacket.decoded.payload = b"hello"
+    meshPacket.decoded.portnum = 1
+    try:
+        with caplog.at_level(logging.ERROR):
+            iface._handlePacketFromRadio(meshPacket, hack=True)
+            assert received.wait(5)
+    finally:
+        pub.unsubscribe(badListener, "meshtastic.receive.text")
+    assert re.search(r"Error in a pubsub listener for meshtastic.receive.text", caplog.text)
+    assert re.search(r"Error in packet callback", caplog.text)
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_hasListeners():
+    """Test that subscribers of parent topics count as listeners"""
+    iface = MeshInterface(noProto=True)
+
+    def onReceive(packet, interface):  # pylint: disable=W0613
+        pass
+
+    assert not iface._hasListeners("meshtastic.test_hasListeners.child")
+    pub.subscribe(onReceive, "meshtastic.test_hasListeners")
+    try:
+        assert iface._hasListeners("meshtastic.test_hasListeners.child")
+    finally:
+        pub.unsubscribe(onReceive, "meshtastic.test_hasListeners")
+
+
 @pytest.mark.unit
 @pytest.mark.usefixtures("reset_globals")
 def test_getNode_with_local():
@@ -233,6 +324,64 @@ def test_handleFromRadio_with_my_info(caplog):
     assert re.search(r"my_node_num: 682584012", caplog.text, re.MULTILINE)
 
 
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_handleFromRadio_with_config():
+    """Test _handleFromRadio with a config variant updates localConfig"""
+    iface = MeshInterface(noProto=True)
+    fromRadio = mesh_pb2.FromRadio()
+    fromRadio.config.lora.hop_limit = 5
+    fromRadio.config.lora.region = 3
+    iface._handleFromRadio(fromRadio.SerializeToString())
+    fromRadio = mesh_pb2.FromRadio()
+    fromRadio.config.position.gps_update_interval = 120
+    iface._handleFromRadio(fromRadio.SerializeToString())
+    iface.close()
+    assert iface.localNode.localConfig.lora.hop_limit == 5
+    assert iface.localNode.localConfig.lora.region == 3
+    assert iface.localNode.localConfig.position.gps_update_interval == 120
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_handleFromRadio_with_moduleConfig():
+    """Test _handleFromRadio with moduleConfig variants updates moduleConfig"""
+    iface = MeshInterface(noProto=True)
+    fromRadio = mesh_pb2.FromRadio()
+    fromRadio.moduleConfig.mqtt.address = "mqtt.example.com"
+    iface._handleFromRadio(fromRadio.SerializeToString())
+    fromRadio = mesh_pb2.FromRadio()
+    fromRadio.moduleConfig.store_forward.records = 42
+    iface._handleFromRadio(fromRadio.SerializeToString())
+    iface.close()
+    assert iface.localNode.moduleConfig.mqtt.address == "mqtt.example.com"
+    assert iface.localNode.moduleConfig.store_forward.records == 42
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_handleFromRadio_subclass_override():
+    """Test _handleFromRadio calls handlers overridden by a subclass"""
+
+    class MyInterface(MeshInterface):
+        """MeshInterface overriding one FromRadio handler"""
+
+        def __init__(self):
+            self.seen = []
+            MeshInterface.__init__(self, noProto=True)
+
+        def _handleMetadataFromRadio(self, metadata):
+            self.seen.append(metadata.firmware_version)
+
+    iface = MyInterface()
+    fromRadio = mesh_pb2.FromRadio()
+    fromRadio.metadata.firmware_version = "2.3.2"
+    iface._handleFromRadio(fromRadio.SerializeToString())
+    iface.close()
+    assert iface.seen == ["2.3.2"]
+    assert iface.metadata is None
+
+
 @pytest.mark.unit
 @pytest.mark.usefixtures("reset_globals")
 def test_handleFromRadio_with_node_info(caplog, capsys):
@@ -366,6 +515,57 @@ def test_sendData_unknown_app(capsys):
     assert pytest_wrapped_e.value.code == 1
 
 
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_sendData_builds_packet_in_place():
+    """Test that sendData sends the same packet it returns, without copying it"""
+    iface = MeshInterface(noProto=True)
+    iface.noProto = False  # let the packet through to _sendToRadio
+    with patch.object(iface, "_sendToRadio") as mock_sendToRadio:
+        p = iface.sendData(b"hello", destinationId=123, portNum=1)
+    toRadio = mock_sendToRadio.call_args[0][0]
+    assert toRadio.packet is p  # the very same message, not a copy
+    assert toRadio.packet.to == 123
+    assert toRadio.packet.decoded.payload == b"hello"
+    assert toRadio.packet.id == p.id != 0
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_sendPacket_copies_callers_packet():
+    """Test that _sendPacket fills in the caller's packet and sends a copy of it"""
+    iface = MeshInterface(noProto=True)
+    iface.noProto = False  # let the packet through to _sendToRadio
+    meshPacket = mesh_pb2.MeshPacket()
+    with patch.object(iface, "_sendToRadio") as mock_sendToRadio:
+        p = iface._sendPacket(meshPacket, destinationId=123)
+    toRadio = mock_sendToRadio.call_args[0][0]
+    assert p is meshPacket
+    assert meshPacket.to == 123
+    assert meshPacket.id != 0
+    assert toRadio.packet == meshPacket
+    assert toRadio.packet is not meshPacket
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_sendToRadio_resend_formats_only_for_debug(caplog):
+    """Test that resending a queued packet only turns it into text when debug logging is on"""
+    iface = MeshInterface(noProto=True)
+    iface.noProto = False
+    queued = MagicMock()
+    queued.__str__.return_value = "queued"
+    iface.queue[1] = queued
+    toRadio = mesh_pb2.ToRadio()
+    toRadio.packet.id = 2
+    with patch.object(iface, "_sendToRadioImpl") as mock_impl:
+        with caplog.at_level(logging.INFO):
+            iface._sendToRadio(toRadio)
+    mock_impl.assert_any_call(queued)
+    mock_impl.assert_any_call(toRadio)
+    assert not queued.__str__.called
+
+
 @pytest.mark.unit
 @pytest.mark.usefixtures("reset_globals")
 def test_sendPosition_with_a_position(caplog):
@@ -579,6 +779,16 @@ def test_nodeNumToId_to_all(iface_with_nodes):
     assert someid == "^all"
 
 
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_nodeNumToId_without_user(iface_with_nodes):
+    """Test _nodeNumToId() for a node we have not received a user for yet"""
+    iface = iface_with_nodes
+    iface.nodesByNum[123] = {"num": 123}
+    someid = iface._nodeNumToId(123)
+    assert someid is None
+
+
 @pytest.mark.unit
 @pytest.mark.usefixtures("reset_globals")
 def test_getOrCreateByNum_minimal(iface_with_nodes):
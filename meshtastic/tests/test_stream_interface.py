@@ -1,7 +1,7 @@
 """Meshtastic unit tests for stream_interface.py"""
 
 import logging
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -36,6 +36,57 @@ def test_StreamInterface_with_noProto(caplog):
         assert data == test_data
 
 
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_StreamInterface_readAvailable():
+    """Test that we read everything the stream has buffered in one call"""
+    stream = MagicMock()
+    stream.in_waiting = 5
+    stream.read.return_value = b"hello"
+    iface = StreamInterface(noProto=True, connectNow=False)
+    iface.stream = stream
+    assert iface._readAvailable() == b"hello"
+    stream.read.assert_called_with(5)
+    stream.in_waiting = 0
+    iface._readAvailable()
+    stream.read.assert_called_with(1)
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+def test_StreamInterface_sendToRadioImpl_formats_only_for_debug(caplog):
+    """Test that the ToRadio is only turned into text when debug logging is on"""
+    stream = MagicMock()
+    toRadio = MagicMock()
+    toRadio.SerializeToString.return_value = b"hello"
+    toRadio.__str__.return_value = "toRadio"
+    iface = StreamInterface(noProto=True, connectNow=False)
+    iface.stream = stream
+    with caplog.at_level(logging.INFO):
+        iface._sendToRadioImpl(toRadio)
+    assert not toRadio.__str__.called
+    stream.write.assert_called_with(b"\x94\xc3\x00\x05hello")
+    with caplog.at_level(logging.DEBUG):
+        iface._sendToRadioImpl(toRadio)
+    assert toRadio.__str__.called
+    assert "Sending: toRadio" in caplog.text
+
+
+@pytest.mark.unit
+@pytest.mark.usefixtures("reset_globals")
+@patch("time.sleep")
+def test_StreamInterface_writeBytes_short_write(mock_sleep):
+    """Test that the rest of the frame is written if the port only took part of it"""
+    stream = MagicMock()
+    stream.write.side_effect = [3, 0, 4]
+    iface = StreamInterface(noProto=True, connectNow=False)
+    iface.stream = stream
+    iface._writeBytes(b"abcdefg")
+    assert [c.args[0] for c in stream.write.call_args_list] == [b"abcdefg", b"defg", b"defg"]
+    stream.flush.assert_called()
+    mock_sleep.assert_called()
+
+
 # TODO
 ### Note: This takes a bit, so moving from unit to slow
 ### Tip: If you want to see the print output, run with '-s' flag:
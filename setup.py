@@ -1,8 +1,17 @@
 # Note: you shouldn't need to run this script manually.  It is run implicitly by the pip3 install command.
 
+import os
 import pathlib
 
 from setuptools import setup
+from setuptools.command.build_ext import build_ext
+
+try:
+    from setuptools.errors import CCompilerError, ExecError, PlatformError
+except ImportError:  # setuptools < 59
+    from distutils.errors import CCompilerError
+    from distutils.errors import DistutilsExecError as ExecError
+    from distutils.errors import DistutilsPlatformError as PlatformError
 
 # The directory containing this file
 HERE = pathlib.Path(__file__).parent
@@ -10,6 +19,46 @@ HERE = pathlib.Path(__file__).parent
 with open("README.md", "r") as fh:
     long_description = fh.read()
 
+# The stream frame parser is plain python, but it runs for every byte we read from the
+# device, so compile it with Cython when available (set SKIP_CYTHON=1 to disable).
+#
+# This is opt-in: Cython is deliberately not in a pyproject.toml build-system.requires, so
+# isolated builds (python -m build, as used for our PyPI release, or a plain pip install of
+# the sdist) never see Cython and produce the pure python, platform independent wheel.
+# To get the compiled module, install Cython and build without isolation, i.e.
+# "pip install cython && pip install --no-build-isolation .".  If the C compile then fails
+# (e.g. no compiler), OptionalBuildExt falls back to the pure python module.
+BUILD_ERRORS = (CCompilerError, ExecError, PlatformError)
+
+
+class OptionalBuildExt(build_ext):
+    """build_ext that treats our (speedup only) extension modules as optional"""
+
+    def run(self):
+        try:
+            build_ext.run(self)
+        except BUILD_ERRORS as ex:  # PlatformError: no usable compiler at all
+            print(f"WARNING: not compiling extension modules ({ex}), using pure python")
+
+    def build_extension(self, ext):
+        try:
+            build_ext.build_extension(self, ext)
+        except BUILD_ERRORS as ex:
+            print(f"WARNING: could not compile {ext.name} ({ex}), using pure python")
+
+
+ext_modules = []
+if not os.environ.get("SKIP_CYTHON"):
+    try:
+        from Cython.Build import cythonize
+
+        ext_modules = cythonize(
+            ["meshtastic/frame_parser.py"],
+            compiler_directives={"language_level": "3"},
+        )
+    except ImportError:
+        pass
+
 # This call to setup() does all the work
 setup(
     name="meshtastic",
@@ -32,6 +81,8 @@ setup(
     ],
     packages=["meshtastic"],
     include_package_data=True,
+    ext_modules=ext_modules,
+    cmdclass={"build_ext": OptionalBuildExt},
     install_requires=[
         "pyserial>=3.4",
         "protobuf>=3.13.0",
@@ -46,7 +97,7 @@ setup(
         "bleak>=0.21.1",
         "packaging",
     ],
-    extras_require={"tunnel": ["pytap2>=2.0.0"]},
+    extras_require={"tunnel": ["pytap2>=2.0.0"], "async": ["pyserial-asyncio>=0.6"]},
     python_requires=">=3.7",
     entry_points={
         "console_scripts": [